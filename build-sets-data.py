@@ -12,13 +12,30 @@ Expected folder structure:
           {set_id}.json   # Cards per set (e.g., sv1.json, me2pt5.json)
 
 Run with: python3 build-sets-data.py
+  (add --pretty for an indented, diff-friendly sets-data.json)
 
 To update data: cd data/pokemon-tcg-data && git pull
 """
 
+import argparse
 import json
+import mmap
 import os
-from collections import defaultdict
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor
+from functools import lru_cache
+from itertools import repeat
+from typing import NamedTuple
+
+try:
+    import orjson
+except ImportError:  # Fall back to the (slower) stdlib parser/serializer
+    orjson = None
+
+try:
+    import simdjson
+except ImportError:  # Card files are then fully parsed with orjson/json
+    simdjson = None
 
 # Directory paths
 SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
@@ -27,6 +44,70 @@ SETS_FILE = os.path.join(DATA_DIR, 'sets', 'en.json')
 CARDS_DIR = os.path.join(DATA_DIR, 'cards', 'en')
 OUTPUT_FILE = os.path.join(SCRIPT_DIR, 'sets-data.json')
 
+# Common TCG suffixes/prefixes that aren't part of the Pokémon's name
+NAME_SUFFIXES = frozenset(('ex', 'gx', 'v', 'vmax', 'vstar', 'vunion'))
+NAME_PREFIXES = frozenset(('team', 'rockets', 'rocket', 'dark', 'light', 'shining', 'radiant'))
+NAME_STOPWORDS = NAME_SUFFIXES | NAME_PREFIXES
+
+# One simdjson parser per process (each pool worker imports this module), so
+# its buffers are allocated once and reused for every set file
+_PARSER = simdjson.Parser() if simdjson else None
+
+# Print a progress line every this many sets
+PROGRESS_EVERY = 10
+
+# Smaller files are read() directly, mapping them isn't worth the syscalls
+MMAP_MIN_SIZE = 64 * 1024
+
+
+def parse_json(data, parser=None):
+    """Parse JSON bytes (or a buffer such as a memoryview)"""
+    if parser:
+        return parser.parse(data)
+    if orjson:
+        return orjson.loads(data)
+    return json.loads(data)
+
+
+def load_json(path, parser=None):
+    """Parse a JSON file, memory-mapping it instead of copying when it's large
+
+    With a simdjson parser the result is a lazy proxy, which is only valid
+    until the parser is used again.
+    """
+    with open(path, 'rb') as f:
+        # The stdlib parser only accepts bytes/str, so it always gets a read()
+        if os.fstat(f.fileno()).st_size < MMAP_MIN_SIZE or not (parser or orjson):
+            return parse_json(f.read(), parser)
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm, memoryview(mm) as view:
+            return parse_json(view, parser)
+
+
+def dumps_json(data, pretty=False):
+    """Serialize data as UTF-8 JSON bytes, compact unless pretty (2-space indent)"""
+    if orjson:
+        return orjson.dumps(data, option=orjson.OPT_INDENT_2 if pretty else None)
+    if pretty:
+        return json.dumps(data, indent=2, ensure_ascii=False).encode('utf-8')
+    return json.dumps(data, ensure_ascii=False, separators=(',', ':')).encode('utf-8')
+
+
+def json_array_item(item_json, index, pretty=False):
+    """Prefix one serialized item of a top-level JSON array with its separator
+
+    Pretty items are indented one more level. Writing '[', the items and then
+    json_array_end() produces the same bytes as dumps_json() on the whole list.
+    """
+    if not pretty:
+        return b',' + item_json if index else item_json
+    # Raw newlines only occur between tokens (they're escaped inside strings)
+    return (b',\n  ' if index else b'\n  ') + item_json.replace(b'\n', b'\n  ')
+
+
+def json_array_end(count, pretty=False):
+    """Closing bracket for a top-level JSON array written with json_array_item()"""
+    return b'\n]' if pretty and count else b']'
+
 
 def load_sets(series_filter=None):
     """Load sets from local JSON file"""
@@ -38,8 +119,7 @@ def load_sets(series_filter=None):
             f"Please clone the repo: git clone https://github.com/PokemonTCG/pokemon-tcg-data.git data/pokemon-tcg-data"
         )
     
-    with open(SETS_FILE, 'r', encoding='utf-8') as f:
-        sets = json.load(f)
+    sets = load_json(SETS_FILE)
     
     # Filter by series if specified
     if series_filter:
@@ -55,132 +135,228 @@ def load_sets(series_filter=None):
     return sets
 
 
-def load_cards_for_set(set_id):
-    """Load cards from local JSON file for a specific set"""
-    cards_file = os.path.join(CARDS_DIR, f'{set_id}.json')
+def find_card_files():
+    """Map set ids to their card files, with a single listing of the cards folder"""
+    if not os.path.isdir(CARDS_DIR):
+        return {}
     
-    if not os.path.exists(cards_file):
-        return None
-    
-    with open(cards_file, 'r', encoding='utf-8') as f:
-        return json.load(f)
+    with os.scandir(CARDS_DIR) as entries:
+        return {
+            entry.name[:-len('.json')]: entry.path
+            for entry in entries
+            if entry.name.endswith('.json') and entry.is_file()
+        }
+
 
+def load_cards_for_set(cards_file):
+    """Load cards from a set's local JSON file
 
+    With simdjson these are lazy proxies into _PARSER's document, which must be
+    released before the next set is loaded.
+    """
+    return load_json(cards_file, _PARSER)
+
+
+@lru_cache(maxsize=8192)
 def normalize_pokemon_name(name):
     """Normalize Pokémon name for grouping cards (fallback when no dex number)"""
     if not name:
         return None
     
-    name = name.lower().strip()
-    
     # Remove common TCG suffixes/prefixes
-    suffixes = ['ex', 'gx', 'v', 'vmax', 'vstar', 'vunion']
-    prefixes = ['team', 'rockets', 'rocket', 'dark', 'light', 'shining', 'radiant']
-    
-    parts = name.split()
-    filtered = [p for p in parts if p not in suffixes and p not in prefixes]
-    
-    return ' '.join(filtered) if filtered else None
+    return ' '.join(p for p in name.lower().split() if p not in NAME_STOPWORDS) or None
+
 
+class CardInfo(NamedTuple):
+    """The fields kept for each Pokémon card, in output order
 
-def build_sets_data(series_filter=None):
-    """Build comprehensive sets data with Pokémon mappings from local files"""
-    sets = load_sets(series_filter=series_filter)
+    A tuple is much smaller than the equivalent dict; it's only converted to a
+    dict (with to_output()) when the set data is built.
+    """
+    card_name: str
+    number: str
+    rarity: str
+    types: list
+    image_small: str
+    subtypes: list
+    dex_numbers: list
     
-    sets_data = []
-    skipped_sets = []
+    def to_output(self):
+        """The card as written to sets-data.json
+
+        Dex numbers are already merged into the Pokémon entry, and empty
+        types/subtypes are left out to keep the file small.
+        """
+        card = {'card_name': self.card_name, 'number': self.number, 'rarity': self.rarity}
+        if self.types:
+            card['types'] = self.types
+        card['image_small'] = self.image_small
+        if self.subtypes:
+            card['subtypes'] = self.subtypes
+        return card
+
+
+def group_pokemon_cards(cards):
+    """Group Pokémon cards by (0, dex number), or (1, normalized name) as fallback
+
+    Each group holds its cards, the normalized name of its first card and
+    running totals (rarity counts, dex numbers) so nothing has to loop over
+    the cards again afterwards. Only the fields we keep are read from each
+    card, so lazy simdjson proxies never get turned into full dicts.
+    """
+    pokemon_cards = {}
+    get_group = pokemon_cards.get
+    no_images = {}  # Shared fallback, instead of a new {} per card
     
-    for idx, set_info in enumerate(sets, 1):
-        set_id = set_info['id']
-        print(f"\n[{idx}/{len(sets)}] Processing: {set_info['name']} ({set_id})")
-        
-        # Load cards for this set
-        cards = load_cards_for_set(set_id)
+    for card in cards:
+        get = card.get
         
-        if cards is None:
-            print(f"  ⚠ No card file found, skipping...")
-            skipped_sets.append({'id': set_id, 'name': set_info['name']})
+        # Only include Pokémon cards
+        if get('supertype') != 'Pokémon':
             continue
         
-        print(f"  Found {len(cards)} cards")
+        # Use nationalPokedexNumbers if available (preferred - no fuzzy matching!)
+        dex_numbers = list(get('nationalPokedexNumbers') or ())
         
-        set_data = {
-            'id': set_id,
-            'name': set_info['name'],
-            'series': set_info.get('series', ''),
-            'release_date': set_info.get('releaseDate', ''),
-            'total_cards': set_info.get('total', 0),
-            'logo': set_info.get('images', {}).get('logo', ''),
-            'symbol': set_info.get('images', {}).get('symbol', ''),
-            'pokemon': []
-        }
-        
-        # Group Pokémon cards by dex number (or normalized name as fallback)
-        pokemon_cards = defaultdict(list)
+        card_name = get('name', '')
         
-        for card in cards:
-            # Only include Pokémon cards
-            if card.get('supertype') != 'Pokémon':
+        # Use first dex number as the key, or fall back to normalized name
+        # (tagged so a dex number and a name can never collide)
+        if dex_numbers:
+            key = (0, dex_numbers[0])
+            norm_name = None
+        else:
+            norm_name = normalize_pokemon_name(card_name)
+            if not norm_name:
                 continue
-            
-            # Use nationalPokedexNumbers if available (preferred - no fuzzy matching!)
-            dex_numbers = card.get('nationalPokedexNumbers', [])
-            
-            # Use first dex number as the key, or fall back to normalized name
-            if dex_numbers:
-                key = f"dex_{dex_numbers[0]}"
-            else:
-                key = normalize_pokemon_name(card.get('name', ''))
-                if not key:
-                    continue
-            
-            card_info = {
-                'card_name': card.get('name', ''),
-                'number': card.get('number', ''),
-                'rarity': card.get('rarity', 'Common'),
-                'types': card.get('types', []),
-                'image_small': card.get('images', {}).get('small', ''),
-                'subtypes': card.get('subtypes', []),
-                'dex_numbers': dex_numbers  # Store for direct lookup
+            key = (1, norm_name)
+        
+        rarity = get('rarity', 'Common')
+        images = get('images') or no_images
+        card_info = CardInfo(
+            card_name=card_name,
+            number=get('number', ''),
+            rarity=rarity,
+            types=list(get('types') or ()),
+            image_small=images.get('small', ''),
+            subtypes=list(get('subtypes') or ()),
+            dex_numbers=dex_numbers  # Store for direct lookup
+        )
+        
+        group = get_group(key)
+        if group is None:
+            # New group (not setdefault(), which would build these for every card).
+            # Only normalize once per group (already done for name keys)
+            group = pokemon_cards[key] = {
+                'cards': [],
+                'norm_name': norm_name or normalize_pokemon_name(card_name),
+                'rarity_counter': Counter(),
+                'dex_set': set(),
             }
-            
-            pokemon_cards[key].append(card_info)
+        group['cards'].append(card_info)
+        if rarity:
+            group['rarity_counter'][rarity] += 1
+        group['dex_set'].update(dex_numbers)
+    
+    return pokemon_cards
+
+
+def process_set(set_info, cards_file):
+    """Build the data for one set from its card file
+
+    Runs in a worker process, so it only takes and returns picklable data.
+    """
+    set_id = set_info['id']
+    
+    # Load cards for this set
+    cards = load_cards_for_set(cards_file)
+    
+    set_data = {
+        'id': set_id,
+        'name': set_info['name'],
+        'series': set_info.get('series', ''),
+        'release_date': set_info.get('releaseDate', ''),
+        'total_cards': set_info.get('total', 0),
+        'logo': set_info.get('images', {}).get('logo', ''),
+        'symbol': set_info.get('images', {}).get('symbol', ''),
+        'pokemon': []
+    }
+    
+    pokemon_cards = group_pokemon_cards(cards)
+    # Drop the parsed document so the simdjson parser can be reused
+    del cards
+    
+    # Add unique Pokémon to set data
+    for key, group in pokemon_cards.items():
+        cards_list = group['cards']
         
-        # Add unique Pokémon to set data
-        for key, cards_list in pokemon_cards.items():
-            # Get the most common rarity for this Pokémon in this set
-            rarities = [c['rarity'] for c in cards_list if c['rarity']]
-            most_common_rarity = max(set(rarities), key=rarities.count) if rarities else 'Common'
-            
-            # Extract dex number from key or from cards
-            if key.startswith('dex_'):
-                dex_num = int(key.split('_')[1])
-                pokemon_name = cards_list[0]['card_name']  # Use original card name
-            else:
-                dex_num = None
-                pokemon_name = key
-            
-            # Get all dex numbers from cards (for cards with multiple)
-            all_dex = set()
-            for c in cards_list:
-                all_dex.update(c.get('dex_numbers', []))
-            
-            set_data['pokemon'].append({
-                'name': normalize_pokemon_name(cards_list[0]['card_name']) or pokemon_name,
-                'dex_number': dex_num,
-                'dex_numbers': sorted(all_dex) if all_dex else [],
-                'rarity': most_common_rarity,
-                'card_count': len(cards_list),
-                'cards': cards_list
-            })
+        # Get the most common rarity for this Pokémon in this set
+        rarity_counter = group['rarity_counter']
+        most_common_rarity = rarity_counter.most_common(1)[0][0] if rarity_counter else 'Common'
         
-        print(f"  ✓ Extracted {len(set_data['pokemon'])} unique Pokémon")
-        sets_data.append(set_data)
+        # Extract dex number from key or from cards
+        if key[0] == 0:
+            dex_num = key[1]
+            pokemon_name = cards_list[0].card_name  # Use original card name
+        else:
+            dex_num = None
+            pokemon_name = key[1]
+        
+        set_data['pokemon'].append({
+            'name': group['norm_name'] or pokemon_name,
+            'dex_number': dex_num,
+            'dex_numbers': sorted(group['dex_set']),  # All dex numbers (for cards with multiple)
+            'rarity': most_common_rarity,
+            'card_count': len(cards_list),
+            'cards': [c.to_output() for c in cards_list]
+        })
+    
+    return set_data
+
+
+def process_set_to_json(set_info, cards_file, pretty=False):
+    """Build one set's data and serialize it, returning (Pokémon count, JSON bytes)
+
+    Serializing in the worker spreads that work across processes too, and
+    sending back one bytes object is much cheaper than pickling the nested
+    set data.
+    """
+    set_data = process_set(set_info, cards_file)
+    return len(set_data['pokemon']), dumps_json(set_data, pretty=pretty)
+
+
+def build_sets_data(sets, skipped_sets=None, pretty=False):
+    """Build comprehensive sets data with Pokémon mappings from local files
+
+    Yields (set_info, Pokémon count, set JSON) one set at a time, so callers
+    can write it out without holding every set in memory. Sets without a card
+    file are appended to skipped_sets instead.
+    """
+    card_files = find_card_files()
+    
+    available_sets = []
+    for set_info in sets:
+        if set_info['id'] in card_files:
+            available_sets.append(set_info)
+        elif skipped_sets is not None:
+            skipped_sets.append({'id': set_info['id'], 'name': set_info['name']})
     
-    return sets_data, skipped_sets
+    # Sets are independent, so process them in parallel (map keeps the order)
+    with ProcessPoolExecutor() as executor:
+        paths = [card_files[s['id']] for s in available_sets]
+        results = executor.map(process_set_to_json, available_sets, paths, repeat(pretty), chunksize=4)
+        for idx, (set_info, (pokemon_count, set_json)) in enumerate(zip(available_sets, results), 1):
+            if idx % PROGRESS_EVERY == 0 or idx == len(available_sets):
+                print(f"[{idx}/{len(available_sets)}] Processed: {set_info['name']} ({set_info['id']}), {pokemon_count} unique Pokémon")
+            yield set_info, pokemon_count, set_json
 
 
 def main():
+    arg_parser = argparse.ArgumentParser(description="Build sets-data.json from local pokemon-tcg-data files")
+    arg_parser.add_argument('--pretty', action='store_true',
+                            help="write indented JSON (bigger, but readable and diff-friendly)")
+    args = arg_parser.parse_args()
+    
     print("=" * 60)
     print("Pokémon TCG Set Data Builder (Local Files)")
     print("=" * 60)
@@ -202,22 +378,32 @@ def main():
         print("\nProcessing ALL series")
     
     try:
-        sets_data, skipped_sets = build_sets_data(series_filter=SERIES_FILTER)
+        sets = load_sets(series_filter=SERIES_FILTER)
+        skipped_sets = []
+        total_sets = 0
+        total_pokemon = 0
         
-        # Save output
-        print(f"\n\nSaving to {OUTPUT_FILE}...")
-        with open(OUTPUT_FILE, 'w', encoding='utf-8') as f:
-            json.dump(sets_data, f, indent=2, ensure_ascii=False)
+        # Stream each set to a temp file as it's built, and only replace the
+        # output once everything was written
+        tmp_file = OUTPUT_FILE + '.tmp'
+        print(f"\nWriting to {OUTPUT_FILE}...")
+        with open(tmp_file, 'wb') as f:
+            f.write(b'[')
+            for _, pokemon_count, set_json in build_sets_data(sets, skipped_sets=skipped_sets, pretty=args.pretty):
+                f.write(json_array_item(set_json, total_sets, pretty=args.pretty))
+                total_sets += 1
+                total_pokemon += pokemon_count
+            f.write(json_array_end(total_sets, pretty=args.pretty))
+        os.replace(tmp_file, OUTPUT_FILE)
         
-        print(f"\n✓ Successfully saved data for {len(sets_data)} sets")
+        print(f"\n✓ Successfully saved data for {total_sets} sets")
         
         # Print summary
-        total_pokemon = sum(len(s['pokemon']) for s in sets_data)
         print(f"\nSummary:")
-        print(f"  Total sets processed: {len(sets_data)}")
+        print(f"  Total sets processed: {total_sets}")
         print(f"  Total Pokémon entries: {total_pokemon}")
-        if sets_data:
-            print(f"  Average Pokémon per set: {total_pokemon / len(sets_data):.1f}")
+        if total_sets:
+            print(f"  Average Pokémon per set: {total_pokemon / total_sets:.1f}")
         
         # Report skipped sets
         if skipped_sets:
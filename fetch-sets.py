@@ -1,20 +1,38 @@
 #!/usr/bin/env python3
 """
 Fetch Pokémon TCG set data from the API and cache it locally
-Run with: python3 fetch-sets.py
+Run with: python3 fetch-sets.py (requires: pip install aiohttp)
 
 This script fetches all sets and their cards, then creates a mapping
 of which Pokémon appear in which sets with their rarities.
 """
 
-import requests
+import aiohttp
+import asyncio
 import json
-import time
+import math
 import os
-from collections import defaultdict
+from collections import Counter
+from functools import lru_cache
+
+try:
+    import orjson
+except ImportError:  # Fall back to the (slower) stdlib parser/serializer
+    orjson = None
 
 API_BASE = 'https://api.pokemontcg.io/v2'
 
+# Maximum number of API requests in flight at once
+MAX_CONCURRENT_REQUESTS = 8
+
+# Print a progress line every this many sets (failures are always printed)
+PROGRESS_EVERY = 10
+
+# Common TCG suffixes/prefixes that aren't part of the Pokémon's name
+NAME_SUFFIXES = frozenset(('ex', 'gx', 'v', 'vmax', 'vstar', 'vunion'))
+NAME_PREFIXES = frozenset(('team', 'rockets', 'rocket', 'dark', 'light', 'shining', 'radiant'))
+NAME_STOPWORDS = NAME_SUFFIXES | NAME_PREFIXES
+
 def load_api_key():
     """Load API key from .api_key file or environment variable"""
     # Try environment variable first
@@ -32,6 +50,18 @@ def load_api_key():
 
 API_KEY = load_api_key()
 
+def load_json(f):
+    """Parse JSON from a file opened in binary mode"""
+    if orjson:
+        return orjson.loads(f.read())
+    return json.load(f)
+
+def dumps_json(data):
+    """Serialize data as indented UTF-8 JSON bytes"""
+    if orjson:
+        return orjson.dumps(data, option=orjson.OPT_INDENT_2)
+    return json.dumps(data, indent=2, ensure_ascii=False).encode('utf-8')
+
 def get_headers():
     """Get headers for API requests, including API key if available"""
     headers = {}
@@ -39,27 +69,33 @@ def get_headers():
         headers['X-Api-Key'] = API_KEY
     return headers
 
-def fetch_with_retry(url, max_retries=3, timeout=120):
-    """Fetch URL with retry logic and exponential backoff"""
+def parse_json(data):
+    """Parse a JSON API response body"""
+    if orjson:
+        return orjson.loads(data)
+    return json.loads(data)
+
+async def fetch_with_retry(session, semaphore, url, max_retries=3, timeout=120):
+    """Fetch URL and parse the JSON response, with retry logic and exponential backoff"""
     for attempt in range(max_retries):
         try:
-            response = requests.get(url, headers=get_headers(), timeout=timeout)
-            response.raise_for_status()
-            return response
-        except (requests.exceptions.Timeout, requests.exceptions.HTTPError) as e:
+            async with semaphore:
+                async with session.get(url, timeout=aiohttp.ClientTimeout(total=timeout)) as response:
+                    response.raise_for_status()
+                    return parse_json(await response.read())
+        except (asyncio.TimeoutError, aiohttp.ClientError) as e:
             if attempt < max_retries - 1:
                 wait_time = 2 ** attempt  # Exponential backoff: 1s, 2s, 4s
-                print(f"  Retry {attempt + 1}/{max_retries} after {wait_time}s...")
-                time.sleep(wait_time)
+                print(f"  Retry {attempt + 1}/{max_retries} after {wait_time}s: {url}")
+                await asyncio.sleep(wait_time)
             else:
                 raise
 
-def fetch_all_sets(series_filter=None):
+async def fetch_all_sets(session, semaphore, series_filter=None):
     """Fetch all Pokémon TCG sets, optionally filtered by series"""
     print("Fetching all sets...")
     url = f"{API_BASE}/sets"
-    response = fetch_with_retry(url)
-    sets = response.json()['data']
+    sets = (await fetch_with_retry(session, semaphore, url))['data']
     
     # Filter by series if specified
     if series_filter:
@@ -71,144 +107,210 @@ def fetch_all_sets(series_filter=None):
     
     return sets
 
-def fetch_cards_for_set(set_id, page=1, page_size=50):
-    """Fetch all cards for a specific set"""
+async def fetch_cards_for_set(session, semaphore, set_id, page=1, page_size=50):
+    """Fetch one page of cards for a specific set"""
     url = f"{API_BASE}/cards?q=set.id:{set_id}&page={page}&pageSize={page_size}"
-    response = fetch_with_retry(url)
-    return response.json()
+    return await fetch_with_retry(session, semaphore, url)
+
+async def fetch_all_cards_for_set(session, semaphore, set_id, page_size=50):
+    """Fetch all cards for a specific set
+
+    The first page tells us how many pages there are, the rest are fetched
+    concurrently.
+    """
+    result = await fetch_cards_for_set(session, semaphore, set_id, 1, page_size=page_size)
+    all_cards = result['data']
+    page_count = math.ceil(result['totalCount'] / page_size)
+    
+    pages = await asyncio.gather(*(
+        fetch_cards_for_set(session, semaphore, set_id, page, page_size=page_size)
+        for page in range(2, page_count + 1)
+    ))
+    for result in pages:
+        all_cards.extend(result['data'])
+    
+    return all_cards
 
+@lru_cache(maxsize=8192)
 def normalize_pokemon_name(name):
     """Normalize Pokémon name to match pokedex-map.json format"""
     if not name:
         return None
     
-    # Convert to lowercase
-    name = name.lower().strip()
+    # Lowercase, split and drop common TCG suffixes/prefixes
+    return ' '.join(p for p in name.lower().split() if p not in NAME_STOPWORDS) or None
+
+def processed_ids_file(output_file):
+    """Path of the sidecar file listing the set ids already in output_file"""
+    return output_file + '.ids'
+
+def load_processed_ids(output_file):
+    """Load the ids of the sets already saved to output_file
+
+    They're read from the sidecar file when it's up to date, so resuming
+    doesn't have to parse the whole output file.
+    """
+    ids_file = processed_ids_file(output_file)
+    if os.path.exists(ids_file) and os.path.getmtime(ids_file) > os.path.getmtime(output_file):
+        with open(ids_file, 'r', encoding='utf-8') as f:
+            return set(f.read().split())
     
-    # Remove common TCG suffixes
-    suffixes = ['ex', 'gx', 'v', 'vmax', 'vstar', 'vunion']
-    prefixes = ['team', 'rockets', 'rocket', 'dark', 'light', 'shining', 'radiant']
+    # No sidecar yet, or the output was rewritten since (e.g. by build-sets-data.py)
+    with open(output_file, 'rb') as f:
+        processed_set_ids = {s['id'] for s in load_json(f)}
+    with open(ids_file, 'w', encoding='utf-8') as f:
+        f.write(''.join(f"{set_id}\n" for set_id in processed_set_ids))
+    return processed_set_ids
+
+def append_set(output_file, set_data):
+    """Add one set to the JSON array in output_file (and its id to the sidecar)
+
+    Only the closing bracket is rewritten, so saving progress doesn't get
+    slower as the file grows.
+    """
+    item = dumps_json(set_data).replace(b'\n', b'\n  ')
+    # A new output file starts a new sidecar, any old one is stale
+    ids_mode = 'a'
     
-    # Split and filter
-    parts = name.split()
-    filtered = [p for p in parts if p not in suffixes and p not in prefixes]
+    if not os.path.exists(output_file):
+        ids_mode = 'w'
+        with open(output_file, 'wb') as f:
+            f.write(b'[\n  ' + item + b'\n]')
+    else:
+        with open(output_file, 'r+b') as f:
+            # Find the array's closing bracket near the end of the file
+            size = f.seek(0, os.SEEK_END)
+            tail_start = max(0, size - 64)
+            f.seek(tail_start)
+            tail = f.read().rstrip()
+            if not tail.endswith(b']'):
+                raise ValueError(f"{output_file} does not contain a JSON array")
+            is_empty = tail[:-1].rstrip().endswith(b'[')
+            
+            f.seek(tail_start + len(tail) - 1)
+            f.write((b'\n  ' if is_empty else b',\n  ') + item + b'\n]')
+            f.truncate()
     
-    return ' '.join(filtered) if filtered else None
+    with open(processed_ids_file(output_file), ids_mode, encoding='utf-8') as f:
+        f.write(f"{set_data['id']}\n")
 
-def build_sets_data(series_filter=None, output_file='sets-data.json'):
-    """Build comprehensive sets data with Pokémon mappings"""
-    sets = fetch_all_sets(series_filter=series_filter)
-    
-    # Load existing progress if available
-    sets_data = []
-    processed_set_ids = set()
-    failed_sets = []
+async def process_set(session, semaphore, set_info, progress):
+    """Fetch one set's cards, build its data and save progress
+
+    Failures are recorded in progress['failed_sets'] so the other sets carry on.
+    """
+    sets_data = progress['sets_data']
     
-    if os.path.exists(output_file):
-        print(f"\nFound existing {output_file}, loading progress...")
-        try:
-            with open(output_file, 'r', encoding='utf-8') as f:
-                sets_data = json.load(f)
-            processed_set_ids = {s['id'] for s in sets_data}
-            print(f"Resuming from {len(sets_data)} already processed sets")
-        except Exception as e:
-            print(f"Could not load existing file: {e}")
-            sets_data = []
-    
-    for idx, set_info in enumerate(sets, 1):
-        # Skip if already processed
-        if set_info['id'] in processed_set_ids:
-            print(f"\n[{idx}/{len(sets)}] Skipping {set_info['name']} ({set_info['id']}) - already processed")
-            continue
+    try:
+        set_data = {
+            'id': set_info['id'],
+            'name': set_info['name'],
+            'series': set_info.get('series', ''),
+            'release_date': set_info.get('releaseDate', ''),
+            'total_cards': set_info.get('total', 0),
+            'logo': set_info.get('images', {}).get('logo', ''),
+            'symbol': set_info.get('images', {}).get('symbol', ''),
+            'pokemon': []  # List of {name, number, rarity, types}
+        }
         
-        print(f"\n[{idx}/{len(sets)}] Processing set: {set_info['name']} ({set_info['id']})")
+        # Fetch all cards for this set
+        all_cards = await fetch_all_cards_for_set(session, semaphore, set_info['id'])
         
-        try:
-            set_data = {
-                'id': set_info['id'],
-                'name': set_info['name'],
-                'series': set_info.get('series', ''),
-                'release_date': set_info.get('releaseDate', ''),
-                'total_cards': set_info.get('total', 0),
-                'logo': set_info.get('images', {}).get('logo', ''),
-                'symbol': set_info.get('images', {}).get('symbol', ''),
-                'pokemon': []  # List of {name, number, rarity, types}
-            }
-            
-            # Fetch all cards for this set
-            page = 1
-            all_cards = []
-            page_size = 50
-            
-            while True:
-                print(f"  Fetching page {page}...")
-                result = fetch_cards_for_set(set_info['id'], page, page_size=page_size)
-                cards = result['data']
-                all_cards.extend(cards)
-                
-                if page >= result['totalCount'] // page_size + 1:
-                    break
-                page += 1
-                time.sleep(0.1)  # Rate limiting
-            
-            print(f"  Found {len(all_cards)} cards")
-            
-            # Extract Pokémon cards (exclude Trainer, Energy, etc.)
-            pokemon_cards = defaultdict(list)
+        # Extract Pokémon cards (exclude Trainer, Energy, etc.)
+        pokemon_cards = {}
+        
+        for card in all_cards:
+            # Only include Pokémon cards
+            if card.get('supertype') != 'Pokémon':
+                continue
             
-            for card in all_cards:
-                # Only include Pokémon cards
-                if card.get('supertype') != 'Pokémon':
-                    continue
-                
-                pokemon_name = normalize_pokemon_name(card.get('name', ''))
-                if not pokemon_name:
-                    continue
-                
-                card_info = {
-                    'card_name': card.get('name', ''),
-                    'number': card.get('number', ''),
-                    'rarity': card.get('rarity', 'Common'),
-                    'types': card.get('types', []),
-                    'image_small': card.get('images', {}).get('small', ''),
-                    'subtypes': card.get('subtypes', [])
-                }
-                
-                pokemon_cards[pokemon_name].append(card_info)
+            pokemon_name = normalize_pokemon_name(card.get('name', ''))
+            if not pokemon_name:
+                continue
             
-            # Add unique Pokémon to set data
-            for pokemon_name, cards in pokemon_cards.items():
-                # Get the most common rarity for this Pokémon in this set
-                rarities = [c['rarity'] for c in cards]
-                most_common_rarity = max(set(rarities), key=rarities.count)
-                
-                set_data['pokemon'].append({
-                    'name': pokemon_name,
-                    'rarity': most_common_rarity,
-                    'card_count': len(cards),
-                    'cards': cards
-                })
+            card_info = {
+                'card_name': card.get('name', ''),
+                'number': card.get('number', ''),
+                'rarity': card.get('rarity', 'Common'),
+                'types': card.get('types', []),
+                'image_small': card.get('images', {}).get('small', ''),
+                'subtypes': card.get('subtypes', [])
+            }
             
-            print(f"  Extracted {len(set_data['pokemon'])} unique Pokémon")
-            sets_data.append(set_data)
+            pokemon_cards.setdefault(pokemon_name, []).append(card_info)
+        
+        # Add unique Pokémon to set data
+        for pokemon_name, cards in pokemon_cards.items():
+            # Get the most common rarity for this Pokémon in this set
+            rarities = [c['rarity'] for c in cards]
+            most_common_rarity = Counter(rarities).most_common(1)[0][0] if rarities else 'Common'
             
-            # Save progress incrementally after each set
+            set_data['pokemon'].append({
+                'name': pokemon_name,
+                'rarity': most_common_rarity,
+                'card_count': len(cards),
+                'cards': cards
+            })
+        
+        sets_data.append(set_data)
+        
+    except Exception as e:
+        print(f"  ✗ {set_info['name']} ({set_info['id']}) FAILED: {e}")
+        progress['failed_sets'].append({'id': set_info['id'], 'name': set_info['name'], 'error': str(e)})
+        set_data = None
+    
+    if set_data is not None:
+        # Save progress incrementally after each set; the write runs in a thread
+        # so other sets keep downloading, and the lock keeps writes in order
+        async with progress['save_lock']:
             try:
-                with open(output_file, 'w', encoding='utf-8') as f:
-                    json.dump(sets_data, f, indent=2, ensure_ascii=False)
-                print(f"  ✓ Saved progress ({len(sets_data)}/{len(sets)} sets)")
+                await asyncio.to_thread(append_set, progress['output_file'], set_data)
             except Exception as e:
-                print(f"  Warning: Could not save progress: {e}")
-            
-        except Exception as e:
-            print(f"  ✗ FAILED: {e}")
-            failed_sets.append({'id': set_info['id'], 'name': set_info['name'], 'error': str(e)})
-            print(f"  Skipping to next set...")
+                print(f"  Warning: Could not save progress for {set_info['id']}: {e}")
+    
+    progress['done'] += 1
+    if progress['done'] % PROGRESS_EVERY == 0 or progress['done'] == progress['pending']:
+        print(f"[{progress['done']}/{progress['pending']}] sets done (latest: {set_info['name']} ({set_info['id']}))")
+
+async def build_sets_data(series_filter=None, output_file='sets-data.json'):
+    """Build comprehensive sets data with Pokémon mappings"""
+    semaphore = asyncio.Semaphore(MAX_CONCURRENT_REQUESTS)
+    
+    async with aiohttp.ClientSession(headers=get_headers()) as session:
+        sets = await fetch_all_sets(session, semaphore, series_filter=series_filter)
+        
+        # Load existing progress if available (new sets get appended to the file)
+        sets_data = []
+        processed_set_ids = set()
         
-        # Small delay between sets
-        time.sleep(0.2)
+        if os.path.exists(output_file):
+            print(f"\nFound existing {output_file}, loading progress...")
+            try:
+                processed_set_ids = load_processed_ids(output_file)
+                print(f"Resuming from {len(processed_set_ids)} already processed sets")
+            except Exception as e:
+                backup_file = output_file + '.bak'
+                print(f"Could not load existing file: {e}")
+                print(f"Moved it to {backup_file}, starting over")
+                os.replace(output_file, backup_file)
+        
+        pending_sets = [s for s in sets if s['id'] not in processed_set_ids]
+        if len(pending_sets) < len(sets):
+            print(f"Skipping {len(sets) - len(pending_sets)} already processed set(s)")
+        
+        progress = {
+            'sets_data': sets_data,
+            'failed_sets': [],
+            'output_file': output_file,
+            'save_lock': asyncio.Lock(),
+            'done': 0,
+            'pending': len(pending_sets),
+        }
+        
+        # Process sets concurrently; the semaphore caps the requests in flight
+        await asyncio.gather(*(process_set(session, semaphore, s, progress) for s in pending_sets))
     
-    return sets_data, failed_sets
+    return sets_data, progress['failed_sets']
 
 def main():
     print("=" * 60)
@@ -222,22 +324,19 @@ def main():
     
     try:
         output_file = 'sets-data.json'
-        sets_data, failed_sets = build_sets_data(series_filter=SERIES_FILTER, output_file=output_file)
-        
-        # Final save (already saved incrementally, but doing it once more for consistency)
-        print(f"\n\nFinal save to {output_file}...")
-        with open(output_file, 'w', encoding='utf-8') as f:
-            json.dump(sets_data, f, indent=2, ensure_ascii=False)
+        sets_data, failed_sets = asyncio.run(build_sets_data(series_filter=SERIES_FILTER, output_file=output_file))
         
-        print(f"\n✓ Successfully saved data for {len(sets_data)} sets")
+        # Every set was already appended to the output file as it finished
+        print(f"\n\n✓ Successfully saved data for {len(sets_data)} new sets")
         print(f"✓ Output file: {output_file}")
         
         # Print summary statistics
         total_pokemon = sum(len(s['pokemon']) for s in sets_data)
         print(f"\nSummary:")
-        print(f"  Total sets: {len(sets_data)}")
-        print(f"  Total Pokémon entries: {total_pokemon}")
-        print(f"  Average Pokémon per set: {total_pokemon / len(sets_data):.1f}")
+        print(f"  New sets: {len(sets_data)}")
+        print(f"  New Pokémon entries: {total_pokemon}")
+        if sets_data:
+            print(f"  Average Pokémon per set: {total_pokemon / len(sets_data):.1f}")
         
         # Report failed sets if any
         if failed_sets: